@@ -4,6 +4,7 @@ API routes for data aggregation (Google Places search).
 from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from database import get_db
@@ -63,29 +64,31 @@ async def aggregate_places_endpoint(
             min_rating=request.min_rating
         )
         
-        # Speichere Suchanfrage in DB
-        search_query = SearchQuery(
-            query=request.query,
-            min_rating=request.min_rating,
-            results_count=result["total_count"]
-        )
-        db.add(search_query)
-        db.flush()  # Um die ID zu bekommen
-        
-        # Speichere alle Places
-        for place_data in result["results"]:
-            place = Place(
-                search_query_id=search_query.id,
-                google_place_id=place_data["google_place_id"],
-                name=place_data["name"],
-                rating_count=place_data["rating_count"],
-                rating_score=place_data["rating_score"],
-                website_url=place_data["website_url"],
-                rank=place_data["rank"]
+        with db.begin():
+            # Speichere Suchanfrage in DB
+            search_query = SearchQuery(
+                query=request.query,
+                min_rating=request.min_rating,
+                results_count=result["total_count"]
             )
-            db.add(place)
-        
-        db.commit()
+            db.add(search_query)
+            db.flush()  # Um die ID zu bekommen
+            
+            # Speichere alle Places in einem Bulk-Insert
+            rows = [
+                {
+                    "search_query_id": search_query.id,
+                    "google_place_id": place_data["google_place_id"],
+                    "name": place_data["name"],
+                    "rating_count": place_data["rating_count"],
+                    "rating_score": place_data["rating_score"],
+                    "website_url": place_data["website_url"],
+                    "rank": place_data["rank"],
+                }
+                for place_data in result["results"]
+            ]
+            if rows:
+                db.execute(insert(Place), rows)
         
         return {
             **result,
@@ -2,21 +2,38 @@
 Authentication module for Caesar ELO.
 Handles Google OAuth and JWT session management.
 """
+import hashlib
+import threading
+import time
 import httpx
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from fastapi import APIRouter, Depends, HTTPException, status
+import jwt
+from cachetools import TTLCache
+from jwt import PyJWTError as JWTError
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 
 from config import get_settings
 
 settings = get_settings()
+
+# Settings used on every request, resolved once at import
+_JWT_SECRET = settings.jwt_secret
+_JWT_ALG = settings.jwt_algorithm
+_JWT_ALGS = [settings.jwt_algorithm]
+_JWT_EXP = timedelta(minutes=settings.jwt_expire_minutes)
+_GOOGLE_AUD = settings.google_client_id
+
 security = HTTPBearer(auto_error=False)
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
+# Recently verified token payloads, keyed by SHA-256 of the raw token
+_jwt_cache: TTLCache = TTLCache(maxsize=10_000, ttl=5)
+_jwt_cache_lock = threading.Lock()
+
 
 class GoogleTokenRequest(BaseModel):
     """Request with Google OAuth credential."""
@@ -37,30 +54,35 @@ class AuthResponse(BaseModel):
     user: UserInfo
 
 
-async def verify_google_token(credential: str) -> Optional[dict]:
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Dependency for getting the shared HTTP client created in the app lifespan."""
+    return request.app.state.http_client
+
+
+async def verify_google_token(credential: str, client: httpx.AsyncClient) -> Optional[dict]:
     """Verify Google ID token and return user info."""
     try:
         # Verify with Google's tokeninfo endpoint
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"https://oauth2.googleapis.com/tokeninfo",
-                params={"id_token": credential}
-            )
-            
-            if response.status_code != 200:
-                return None
-            
-            data = response.json()
-            
-            # Verify the token is for our app
-            if data.get("aud") != settings.google_client_id:
-                return None
-            
-            return {
-                "email": data.get("email"),
-                "name": data.get("name"),
-                "picture": data.get("picture"),
-            }
+        response = await client.get(
+            f"https://oauth2.googleapis.com/tokeninfo",
+            params={"id_token": credential},
+            timeout=10.0
+        )
+        
+        if response.status_code != 200:
+            return None
+        
+        data = response.json()
+        
+        # Verify the token is for our app
+        if data.get("aud") != _GOOGLE_AUD:
+            return None
+        
+        return {
+            "email": data.get("email"),
+            "name": data.get("name"),
+            "picture": data.get("picture"),
+        }
     except Exception:
         return None
 
@@ -68,32 +90,51 @@ async def verify_google_token(credential: str) -> Optional[dict]:
 def create_access_token(data: dict) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.jwt_expire_minutes)
+    expire = datetime.utcnow() + _JWT_EXP
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algorithm)
+    return jwt.encode(to_encode, _JWT_SECRET, algorithm=_JWT_ALG)
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> Optional[dict]:
-    """Get current user from JWT token. Returns None if not authenticated."""
+def _decode_and_verify(token: str) -> dict:
+    """
+    Decode and verify a JWT, reusing recently verified payloads.
+    Raises JWTError if the token is invalid; failures are never cached.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    with _jwt_cache_lock:
+        payload = _jwt_cache.get(key)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    
+    payload = jwt.decode(
+        token,
+        _JWT_SECRET,
+        algorithms=_JWT_ALGS,
+        options={"require": ["exp", "email"]}
+    )
+    with _jwt_cache_lock:
+        _jwt_cache[key] = payload
+    return payload
+
+
+def _verify(credentials: Optional[HTTPAuthorizationCredentials]) -> Optional[dict]:
+    """Return the verified token payload, or None if missing or invalid."""
     if not credentials:
         return None
     
     try:
-        payload = jwt.decode(
-            credentials.credentials, 
-            settings.jwt_secret, 
-            algorithms=[settings.jwt_algorithm]
-        )
-        email = payload.get("email")
-        if email is None:
-            return None
-        return payload
+        return _decode_and_verify(credentials.credentials)
     except JWTError:
         return None
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Optional[dict]:
+    """Get current user from JWT token. Returns None if not authenticated."""
+    return _verify(credentials)
+
+
 async def require_auth(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
@@ -105,34 +146,26 @@ async def require_auth(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    try:
-        payload = jwt.decode(
-            credentials.credentials, 
-            settings.jwt_secret, 
-            algorithms=[settings.jwt_algorithm]
-        )
-        email = payload.get("email")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token",
-            )
-        return payload
-    except JWTError:
+    payload = _verify(credentials)
+    if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token",
         )
+    return payload
 
 
 @router.post("/google", response_model=AuthResponse)
-async def google_auth(request: GoogleTokenRequest):
+async def google_auth(
+    request: GoogleTokenRequest,
+    client: httpx.AsyncClient = Depends(get_http_client)
+):
     """
     Authenticate with Google OAuth.
     Accepts the Google ID token (credential) from Google Sign-In.
     Returns a JWT access token for subsequent API calls.
     """
-    user_info = await verify_google_token(request.credential)
+    user_info = await verify_google_token(request.credential, client)
     
     if not user_info:
         raise HTTPException(
@@ -1,12 +1,16 @@
 """
 API routes for Caesar ELO.
 """
-import random
-from datetime import datetime
+import threading
+from math import pow as fpow
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, select
+from cachetools import TTLCache
 
 from database import get_db
 from models import Website, Comparison, WebsiteGrade, ScrapeJob
@@ -19,16 +23,40 @@ from schemas import (
     WebsiteGradeResponse,
     ComparisonPair, 
     ComparisonCreate, 
+    ComparisonCreateBody,
     ComparisonResponse,
     ScrapeConfigCreate,
     ScrapeJobResponse,
     StatsResponse,
     StackStats
 )
-from tasks import run_scrape_job
+from tasks import run_scrape_job_async
 
 router = APIRouter(prefix="/api", tags=["api"])
 
+# ELO K-factor
+K = 32
+
+# Prebuilt serializers for the hot list endpoints
+_websites_adapter = TypeAdapter(List[WebsiteResponse])
+_leaderboard_adapter = TypeAdapter(List[WebsiteLeaderboardItem])
+_scrape_jobs_adapter = TypeAdapter(List[ScrapeJobResponse])
+
+# Columns needed by WebsiteResponse, selected instead of full ORM rows
+_WEBSITE_RESPONSE_COLUMNS = [getattr(Website, field) for field in WebsiteResponse.model_fields]
+
+# Short-lived memo for /stats, keyed by a version bumped on every write
+_stats_cache: TTLCache = TTLCache(maxsize=1, ttl=10)
+_stats_lock = threading.Lock()
+_stats_version = 0
+
+
+def _invalidate_stats():
+    """Invalidate the cached /stats response after a write."""
+    global _stats_version
+    with _stats_lock:
+        _stats_version += 1
+
 
 # --- Website Endpoints ---
 
@@ -42,7 +70,7 @@ def list_websites(
     db: Session = Depends(get_db)
 ):
     """List all websites with optional filters."""
-    query = db.query(Website)
+    query = db.query(*_WEBSITE_RESPONSE_COLUMNS)
     
     if is_graded is not None:
         query = query.filter(Website.is_graded == is_graded)
@@ -51,8 +79,9 @@ def list_websites(
     if is_good_lead is not None:
         query = query.filter(Website.is_good_lead == is_good_lead)
     
-    websites = query.offset(skip).limit(limit).all()
-    return websites
+    rows = query.offset(skip).limit(limit).all()
+    items = _websites_adapter.validate_python(rows, from_attributes=True)
+    return ORJSONResponse(_websites_adapter.dump_python(items, mode="json"))
 
 
 @router.post("/websites", response_model=WebsiteResponse)
@@ -66,14 +95,19 @@ def create_website(website: WebsiteCreate, db: Session = Depends(get_db)):
     db_website = Website(**website.model_dump())
     db.add(db_website)
     db.commit()
-    db.refresh(db_website)
+    _invalidate_stats()
     return db_website
 
 
 @router.get("/websites/{website_id}", response_model=WebsiteWithGrade)
 def get_website(website_id: int, db: Session = Depends(get_db)):
     """Get a specific website by ID with its grades."""
-    website = db.query(Website).filter(Website.id == website_id).first()
+    website = (
+        db.query(Website)
+        .options(joinedload(Website.grades))
+        .filter(Website.id == website_id)
+        .first()
+    )
     if not website:
         raise HTTPException(status_code=404, detail="Website not found")
     return website
@@ -96,12 +130,22 @@ def get_next_ungraded(db: Session = Depends(get_db)):
 @router.get("/stack/stats", response_model=StackStats)
 def get_stack_stats(db: Session = Depends(get_db)):
     """Get stats about the grading stack."""
-    return StackStats(
-        ungraded_count=db.query(func.count(Website.id)).filter(Website.is_graded == False).scalar() or 0,
-        graded_count=db.query(func.count(Website.id)).filter(Website.is_graded == True).scalar() or 0,
-        designvorlage_count=db.query(func.count(Website.id)).filter(Website.is_designvorlage == True).scalar() or 0,
-        good_lead_count=db.query(func.count(Website.id)).filter(Website.is_good_lead == True).scalar() or 0,
+    # Single scan with conditional aggregates instead of one COUNT per flag
+    row = db.query(
+        func.count(Website.id).filter(Website.is_graded == False).label("ungraded"),
+        func.count(Website.id).filter(Website.is_graded == True).label("graded"),
+        func.count(Website.id).filter(Website.is_designvorlage == True).label("designvorlage"),
+        func.count(Website.id).filter(Website.is_good_lead == True).label("good_lead"),
+    ).one()
+    
+    # Aggregates are trusted DB data, so skip validation and serialize directly
+    stats = StackStats.model_construct(
+        ungraded_count=row.ungraded or 0,
+        graded_count=row.graded or 0,
+        designvorlage_count=row.designvorlage or 0,
+        good_lead_count=row.good_lead or 0,
     )
+    return ORJSONResponse(stats.model_dump())
 
 
 @router.post("/websites/{website_id}/grade", response_model=WebsiteGradeResponse)
@@ -127,7 +171,6 @@ def grade_website(website_id: int, grade: WebsiteGradeCreate, db: Session = Depe
         if grade.general_comment is not None:
             existing_grade.general_comment = grade.general_comment
         
-        existing_grade.updated_at = datetime.utcnow()
         db_grade = existing_grade
     else:
         # Create new grade
@@ -149,10 +192,11 @@ def grade_website(website_id: int, grade: WebsiteGradeCreate, db: Session = Depe
     website.is_designvorlage = grade.is_designvorlage
     website.is_good_lead = grade.is_good_lead
     website.is_graded = True
-    website.graded_at = datetime.utcnow()
+    website.graded_at = func.now()
     
     db.commit()
     db.refresh(db_grade)
+    _invalidate_stats()
     
     return db_grade
 
@@ -165,8 +209,9 @@ def skip_website(website_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Website not found")
     
     website.is_graded = True
-    website.graded_at = datetime.utcnow()
+    website.graded_at = func.now()
     db.commit()
+    _invalidate_stats()
     
     return {"status": "skipped", "website_id": website_id}
 
@@ -176,28 +221,55 @@ def skip_website(website_id: int, db: Session = Depends(get_db)):
 @router.get("/compare", response_model=ComparisonPair)
 def get_comparison_pair(db: Session = Depends(get_db)):
     """Get two random websites for comparison."""
-    # Get all website IDs
-    websites = db.query(Website).all()
+    # Pick two random websites in SQL instead of loading the whole table
+    # TODO: Implement smarter matching (e.g., similar ELO ratings)
+    selected = db.query(Website).order_by(func.random()).limit(2).all()
     
-    if len(websites) < 2:
+    if len(selected) < 2:
         raise HTTPException(
             status_code=400, 
             detail="Need at least 2 websites to compare"
         )
     
-    # Pick two random websites
-    # TODO: Implement smarter matching (e.g., similar ELO ratings)
-    selected = random.sample(websites, 2)
-    
     return ComparisonPair(website_a=selected[0], website_b=selected[1])
 
 
-@router.post("/compare", response_model=ComparisonResponse)
-def submit_comparison(comparison: ComparisonCreate, db: Session = Depends(get_db)):
+async def parse_comparison_body(request: Request) -> ComparisonCreateBody:
+    """Decode and validate the comparison body with msgspec instead of Pydantic."""
+    try:
+        return msgspec.json.decode(await request.body(), type=ComparisonCreateBody)
+    except msgspec.ValidationError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except msgspec.DecodeError:
+        raise HTTPException(status_code=422, detail="Invalid JSON body")
+
+
+@router.post(
+    "/compare",
+    response_model=ComparisonResponse,
+    # Document the body with the Pydantic schema; parsing happens in msgspec
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": ComparisonCreate.model_json_schema()}},
+        }
+    },
+)
+def submit_comparison(
+    comparison: ComparisonCreateBody = Depends(parse_comparison_body),
+    db: Session = Depends(get_db)
+):
     """Submit a comparison result and update ELO ratings."""
-    # Validate websites exist
-    website_a = db.query(Website).filter(Website.id == comparison.website_a_id).first()
-    website_b = db.query(Website).filter(Website.id == comparison.website_b_id).first()
+    # Validate websites exist (both fetched and locked in one query)
+    websites = {
+        w.id: w
+        for w in db.query(Website)
+        .filter(Website.id.in_([comparison.website_a_id, comparison.website_b_id]))
+        .with_for_update()
+        .all()
+    }
+    website_a = websites.get(comparison.website_a_id)
+    website_b = websites.get(comparison.website_b_id)
     
     if not website_a or not website_b:
         raise HTTPException(status_code=404, detail="Website not found")
@@ -210,8 +282,7 @@ def submit_comparison(comparison: ComparisonCreate, db: Session = Depends(get_db
     elo_change_b = 0.0
     
     if comparison.winner_id:
-        K = 32  # K-factor
-        expected_a = 1 / (1 + 10 ** ((website_b.elo_rating - website_a.elo_rating) / 400))
+        expected_a = 1.0 / (1.0 + fpow(10.0, (website_b.elo_rating - website_a.elo_rating) / 400.0))
         expected_b = 1 - expected_a
         
         if comparison.winner_id == website_a.id:
@@ -240,7 +311,7 @@ def submit_comparison(comparison: ComparisonCreate, db: Session = Depends(get_db
     )
     db.add(db_comparison)
     db.commit()
-    db.refresh(db_comparison)
+    _invalidate_stats()
     
     return db_comparison
 
@@ -266,7 +337,7 @@ def start_scrape_job(
     db.refresh(job)
     
     # Trigger background scraping task
-    background_tasks.add_task(run_scrape_job, job.id)
+    background_tasks.add_task(run_scrape_job_async, job.id)
     
     return job
 
@@ -283,7 +354,8 @@ def list_scrape_jobs(
         .limit(limit)
         .all()
     )
-    return jobs
+    items = _scrape_jobs_adapter.validate_python(jobs, from_attributes=True)
+    return ORJSONResponse(_scrape_jobs_adapter.dump_python(items, mode="json"))
 
 
 @router.get("/scrape/jobs/{job_id}", response_model=ScrapeJobResponse)
@@ -299,42 +371,68 @@ def get_scrape_job(job_id: int, db: Session = Depends(get_db)):
 
 @router.get("/leaderboard", response_model=List[WebsiteLeaderboardItem])
 def get_leaderboard(
+    skip: int = 0,
     limit: int = 50, 
     db: Session = Depends(get_db)
 ):
     """Get websites ranked by ELO rating."""
-    websites = (
-        db.query(Website)
-        .order_by(Website.elo_rating.desc())
+    # Rank in SQL so it stays global when paging with skip
+    leaderboard_order = (Website.elo_rating.desc(), Website.id)
+    rank = func.row_number().over(order_by=leaderboard_order).label("rank")
+    
+    # Select only the leaderboard columns to skip ORM object hydration
+    rows = (
+        db.query(
+            Website.id,
+            Website.url,
+            Website.name,
+            Website.screenshot_path,
+            Website.elo_rating,
+            Website.matches_played,
+            Website.wins,
+            Website.losses,
+            rank,
+        )
+        .order_by(*leaderboard_order)
+        .offset(skip)
         .limit(limit)
         .all()
     )
     
-    return [
-        WebsiteLeaderboardItem(
-            **{**website.__dict__, "rank": idx + 1}
-        )
-        for idx, website in enumerate(websites)
-    ]
+    # Rows come straight from the DB, so skip per-field validation
+    items = [WebsiteLeaderboardItem.model_construct(**row._mapping) for row in rows]
+    return ORJSONResponse(_leaderboard_adapter.dump_python(items, mode="json"))
 
 
 # --- Stats ---
 
 @router.get("/stats", response_model=StatsResponse)
 def get_stats(db: Session = Depends(get_db)):
-    """Get system statistics."""
-    total_websites = db.query(func.count(Website.id)).scalar() or 0
-    total_comparisons = db.query(func.count(Comparison.id)).scalar() or 0
-    total_graded = db.query(func.count(Website.id)).filter(Website.is_graded == True).scalar() or 0
-    total_designvorlage = db.query(func.count(Website.id)).filter(Website.is_designvorlage == True).scalar() or 0
-    total_good_leads = db.query(func.count(Website.id)).filter(Website.is_good_lead == True).scalar() or 0
-    avg_elo = db.query(func.avg(Website.elo_rating)).scalar() or 1000.0
+    """Get system statistics (cached for a few seconds)."""
+    with _stats_lock:
+        version = _stats_version
+        cached = _stats_cache.get(version)
+    if cached is not None:
+        return ORJSONResponse(cached)
     
-    return StatsResponse(
-        total_websites=total_websites,
-        total_comparisons=total_comparisons,
-        total_graded=total_graded,
-        total_designvorlage=total_designvorlage,
-        total_good_leads=total_good_leads,
-        avg_elo=avg_elo
-    )
+    # All website aggregates in one scan, comparison count as a scalar subquery
+    row = db.query(
+        func.count(Website.id).label("total"),
+        func.count(Website.id).filter(Website.is_graded == True).label("graded"),
+        func.count(Website.id).filter(Website.is_designvorlage == True).label("designvorlage"),
+        func.count(Website.id).filter(Website.is_good_lead == True).label("good_leads"),
+        func.avg(Website.elo_rating).label("avg_elo"),
+        select(func.count(Comparison.id)).scalar_subquery().label("comparisons"),
+    ).one()
+    
+    stats = StatsResponse.model_construct(
+        total_websites=row.total or 0,
+        total_comparisons=row.comparisons or 0,
+        total_graded=row.graded or 0,
+        total_designvorlage=row.designvorlage or 0,
+        total_good_leads=row.good_leads or 0,
+        avg_elo=float(row.avg_elo or 1000.0)
+    ).model_dump()
+    with _stats_lock:
+        _stats_cache[version] = stats
+    return ORJSONResponse(stats)
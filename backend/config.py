@@ -4,7 +4,7 @@ Loads settings from environment variables.
 """
 import os
 from functools import lru_cache
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
 # Load .env file
@@ -28,13 +28,12 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./caesar_elo.db"
+    auto_create_tables: bool = True  # Create missing tables/indexes on startup
     
     # Frontend
     frontend_url: str = "http://localhost:5173"
     
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
 
 @lru_cache()
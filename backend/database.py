@@ -1,17 +1,35 @@
 """
 Database configuration for Caesar ELO.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 DATABASE_URL = "sqlite:///./caesar_elo.db"
 
 engine = create_engine(
     DATABASE_URL, 
-    connect_args={"check_same_thread": False}  # SQLite specific
+    connect_args={"check_same_thread": False},  # SQLite specific
+    pool_size=10,
+    insertmanyvalues_page_size=100  # Rows per batched multi-row INSERT
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@event.listens_for(engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Enable WAL and relaxed sync on every new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    cursor.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA mmap_size=268435456;"
+        "PRAGMA cache_size=-65536;"
+    )
+    cursor.close()
+
+
+# Objects stay loaded after commit so endpoints can return them without a reload
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 Base = declarative_base()
 
@@ -0,0 +1,32 @@
+"""
+Shared HTTP client for outbound API calls (Google OAuth, Maps, Places).
+"""
+from typing import Optional
+import httpx
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_client() -> httpx.AsyncClient:
+    """Create an AsyncClient with HTTP/2 and connection pooling."""
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_client()
+    return _client
+
+
+async def close_client():
+    """Close the shared AsyncClient. Called on app shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
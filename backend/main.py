@@ -2,24 +2,77 @@
 Caesar ELO - Website Rating System
 FastAPI application entry point.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import os
 
+from config import get_settings
+from sqlalchemy import bindparam, inspect, select, text
 from database import engine, Base
+from models import Website, url_hash
+from http_client import get_client, close_client
 from api.routes import router as api_router
 from api.aggregation import router as aggregation_router
 from api.auth import router as auth_router
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+settings = get_settings()
+
+
+def add_url_hash_column():
+    """Add and backfill websites.url_sha1 on databases created before it existed."""
+    columns = {column["name"] for column in inspect(engine).get_columns("websites")}
+    if "url_sha1" in columns:
+        return
+    
+    websites = Website.__table__
+    column_type = websites.c.url_sha1.type.compile(dialect=engine.dialect)
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE websites ADD COLUMN url_sha1 {column_type}"))
+        rows = conn.execute(select(websites.c.id, websites.c.url)).all()
+        if rows:
+            conn.execute(
+                websites.update()
+                .where(websites.c.id == bindparam("website_id"))
+                .values(url_sha1=bindparam("hash")),
+                [{"website_id": row.id, "hash": url_hash(row.url)} for row in rows]
+            )
+
+
+def create_tables():
+    """Create database tables and any indexes missing from existing tables."""
+    Base.metadata.create_all(bind=engine)
+    add_url_hash_column()
+    
+    # create_all skips existing tables, so add indexes introduced after creation
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    if settings.auto_create_tables:
+        create_tables()
+    
+    # Shared HTTP client so outbound calls reuse pooled connections
+    app.state.http_client = get_client()
+    try:
+        yield
+    finally:
+        await close_client()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Caesar ELO",
     description="ELO-based website rating system for scraped Google Maps sites",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -1,18 +1,30 @@
 """
 SQLAlchemy models for Caesar ELO.
 """
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, JSON
+import hashlib
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, JSON, Index, LargeBinary, text, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from database import Base
 
 
+def url_hash(url: str) -> bytes:
+    """SHA-1 of the normalized URL (case, whitespace, trailing slash), used for dedup lookups."""
+    return hashlib.sha1(url.strip().lower().rstrip("/").encode()).digest()
+
+
+def _default_url_hash(context) -> bytes:
+    """Column default computing url_sha1 from the row's url on insert."""
+    return url_hash(context.get_current_parameters()["url"])
+
+
 class Website(Base):
     """Represents a scraped website with its ELO rating and classification."""
     __tablename__ = "websites"
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String(2048), unique=True, nullable=False)
+    url_sha1 = Column(LargeBinary(20), nullable=False, index=True, default=_default_url_hash)  # Compact dedup key
     name = Column(String(255), nullable=True)  # Business name from GMaps
     description = Column(Text, nullable=True)
     screenshot_path = Column(String(512), nullable=True)
@@ -35,20 +47,47 @@ class Website(Base):
     business_type = Column(String(255), nullable=True)  # e.g., "restaurant", "gym"
     address = Column(Text, nullable=True)
     phone = Column(String(50), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), nullable=False)
 
-    # Relationships
-    grades = relationship("WebsiteGrade", back_populates="website", uselist=False)
+    # Relationships (never lazy-loaded; use selectinload/joinedload explicitly)
+    grades = relationship("WebsiteGrade", back_populates="website", uselist=False, lazy="raise_on_sql")
     comparisons_as_a = relationship(
         "Comparison", 
         foreign_keys="Comparison.website_a_id",
-        back_populates="website_a"
+        back_populates="website_a",
+        lazy="raise_on_sql"
     )
     comparisons_as_b = relationship(
         "Comparison", 
         foreign_keys="Comparison.website_b_id",
-        back_populates="website_b"
+        back_populates="website_b",
+        lazy="raise_on_sql"
+    )
+
+    # Indexes for the stack, listing and leaderboard queries
+    __table_args__ = (
+        Index(
+            "ix_website_ungraded_created",
+            created_at,
+            sqlite_where=text("is_graded = 0"),
+            postgresql_where=text("is_graded = false"),
+        ),
+        Index("ix_website_elo_desc", elo_rating.desc(), id),
+        Index("ix_website_flags", is_graded, is_designvorlage, is_good_lead),
+        # Partial indexes for the rare flags, so filtering on them reads only matches
+        Index(
+            "ix_website_designvorlage",
+            is_designvorlage,
+            sqlite_where=text("is_designvorlage = 1"),
+            postgresql_where=text("is_designvorlage = true"),
+        ),
+        Index(
+            "ix_website_good_lead",
+            is_good_lead,
+            sqlite_where=text("is_good_lead = 1"),
+            postgresql_where=text("is_good_lead = true"),
+        ),
     )
 
 
@@ -69,17 +108,22 @@ class WebsiteGrade(Base):
     mobile_responsiveness = Column(Integer, nullable=True)
     
     # Notes per field for taxonomy examples (JSON: {"field_name": "note text"})
-    notes = Column(JSON, nullable=True, default=dict)
+    notes = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True, default=dict)
     
     # General comments
     general_comment = Column(Text, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), nullable=False)
     
     # Relationship
     website = relationship("Website", back_populates="grades")
 
+    # GIN index for note-key lookups (Postgres only; SQLite stores JSON as text)
+    __table_args__ = (
+        Index("ix_grade_notes_gin", notes, postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
 
 class Comparison(Base):
     """Records a single comparison between two websites."""
@@ -95,7 +139,7 @@ class Comparison(Base):
     elo_change_a = Column(Float, nullable=True)
     elo_change_b = Column(Float, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationships
     website_a = relationship("Website", foreign_keys=[website_a_id], back_populates="comparisons_as_a")
@@ -121,7 +165,7 @@ class ScrapeJob(Base):
     websites_found = Column(Integer, default=0)
     error_message = Column(Text, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     completed_at = Column(DateTime, nullable=True)
 
 
@@ -133,7 +177,7 @@ class SearchQuery(Base):
     query = Column(String(255), nullable=False)
     min_rating = Column(Float, nullable=True)
     results_count = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationship
     places = relationship("Place", back_populates="search_query")
@@ -153,7 +197,7 @@ class Place(Base):
     website_url = Column(String(2048), nullable=True)
     rank = Column(Integer, nullable=False)  # Rang in dieser Suche
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), nullable=False)
     
     # Relationship
     search_query = relationship("SearchQuery", back_populates="places")
@@ -3,7 +3,8 @@ Pydantic schemas for API request/response validation.
 """
 from datetime import datetime
 from typing import Optional, Dict, List
-from pydantic import BaseModel, Field
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # --- Website Schemas ---
@@ -35,8 +36,7 @@ class WebsiteResponse(WebsiteBase):
     graded_at: Optional[datetime] = None
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WebsiteLeaderboardItem(BaseModel):
@@ -50,8 +50,7 @@ class WebsiteLeaderboardItem(BaseModel):
     losses: int
     rank: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Grading Schemas ---
@@ -88,8 +87,7 @@ class WebsiteGradeResponse(BaseModel):
     general_comment: Optional[str]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class WebsiteWithGrade(WebsiteResponse):
@@ -112,6 +110,13 @@ class ComparisonCreate(BaseModel):
     winner_id: Optional[int] = None  # NULL = skip
 
 
+class ComparisonCreateBody(msgspec.Struct):
+    """msgspec mirror of ComparisonCreate, decoded directly on the hot POST path."""
+    website_a_id: int
+    website_b_id: int
+    winner_id: Optional[int] = None  # NULL = skip
+
+
 class ComparisonResponse(BaseModel):
     id: int
     website_a_id: int
@@ -121,8 +126,7 @@ class ComparisonResponse(BaseModel):
     elo_change_b: Optional[float]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Scraping Schemas ---
@@ -145,8 +149,7 @@ class ScrapeJobResponse(BaseModel):
     created_at: datetime
     completed_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # --- Stats Schemas ---
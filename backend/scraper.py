@@ -5,10 +5,10 @@ Uses Google Maps Places API (New).
 import asyncio
 import httpx
 from typing import List, Optional, Dict, Any
-from urllib.parse import urlparse
 import logging
 
 from config import get_settings
+from http_client import create_client, get_client
 
 logger = logging.getLogger(__name__)
 
@@ -47,36 +47,39 @@ BUSINESS_TYPES = [
 ]
 
 
-async def geocode_location(location: str) -> Optional[Dict[str, float]]:
+async def geocode_location(
+    location: str,
+    client: Optional[httpx.AsyncClient] = None
+) -> Optional[Dict[str, float]]:
     """Convert a location string to lat/lng coordinates."""
     if not settings.google_maps_api_key:
         logger.error("GOOGLE_MAPS_API_KEY not set")
         return None
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            GEOCODE_URL,
-            params={
-                "address": location,
-                "key": settings.google_maps_api_key
-            }
-        )
-        
-        if response.status_code != 200:
-            logger.error(f"Geocode failed: {response.status_code}")
-            return None
-        
-        data = response.json()
-        
-        if data.get("status") != "OK" or not data.get("results"):
-            logger.error(f"Geocode returned no results for: {location}")
-            return None
-        
-        location_data = data["results"][0]["geometry"]["location"]
-        return {
-            "latitude": location_data["lat"],
-            "longitude": location_data["lng"]
+    client = client or get_client()
+    response = await client.get(
+        GEOCODE_URL,
+        params={
+            "address": location,
+            "key": settings.google_maps_api_key
         }
+    )
+    
+    if response.status_code != 200:
+        logger.error(f"Geocode failed: {response.status_code}")
+        return None
+    
+    data = response.json()
+    
+    if data.get("status") != "OK" or not data.get("results"):
+        logger.error(f"Geocode returned no results for: {location}")
+        return None
+    
+    location_data = data["results"][0]["geometry"]["location"]
+    return {
+        "latitude": location_data["lat"],
+        "longitude": location_data["lng"]
+    }
 
 
 async def search_nearby_places(
@@ -84,7 +87,8 @@ async def search_nearby_places(
     longitude: float,
     radius_km: float = 10.0,
     included_types: Optional[List[str]] = None,
-    max_results: int = 20
+    max_results: int = 20,
+    client: Optional[httpx.AsyncClient] = None
 ) -> List[Dict[str, Any]]:
     """
     Search for places near a location using Places API (New).
@@ -118,19 +122,19 @@ async def search_nearby_places(
         "X-Goog-FieldMask": "places.id,places.displayName,places.formattedAddress,places.websiteUri,places.primaryType,places.nationalPhoneNumber"
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            PLACES_NEARBY_URL,
-            json=request_body,
-            headers=headers
-        )
-        
-        if response.status_code != 200:
-            logger.error(f"Places API failed: {response.status_code} - {response.text}")
-            return []
-        
-        data = response.json()
-        return data.get("places", [])
+    client = client or get_client()
+    response = await client.post(
+        PLACES_NEARBY_URL,
+        json=request_body,
+        headers=headers
+    )
+    
+    if response.status_code != 200:
+        logger.error(f"Places API failed: {response.status_code} - {response.text}")
+        return []
+    
+    data = response.json()
+    return data.get("places", [])
 
 
 def extract_website_data(place: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -140,9 +144,8 @@ def extract_website_data(place: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if not website_url:
         return None
     
-    # Normalize URL
-    parsed = urlparse(website_url)
-    if not parsed.scheme:
+    # Normalize URL (plain substring check; urlparse is costly per place)
+    if "://" not in website_url:
         website_url = f"https://{website_url}"
     
     return {
@@ -158,7 +161,8 @@ def extract_website_data(place: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 async def scrape_websites_from_location(
     location: str,
     radius_km: float = 10.0,
-    business_types: Optional[List[str]] = None
+    business_types: Optional[List[str]] = None,
+    client: Optional[httpx.AsyncClient] = None
 ) -> List[Dict[str, Any]]:
     """
     Main function to scrape websites from a location.
@@ -167,22 +171,38 @@ async def scrape_websites_from_location(
         location: City or address to search around
         radius_km: Search radius in kilometers (max 50)
         business_types: List of business types to filter by
+        client: HTTP client to use (defaults to the shared client)
     
     Returns:
         List of website data dictionaries
     """
     # Geocode location
-    coords = await geocode_location(location)
+    coords = await geocode_location(location, client=client)
     if not coords:
         return []
     
-    # Search for places
-    places = await search_nearby_places(
-        latitude=coords["latitude"],
-        longitude=coords["longitude"],
-        radius_km=radius_km,
-        included_types=business_types
-    )
+    # Search for places, one concurrent request per business type
+    if business_types and len(business_types) > 1:
+        type_filters = [[business_type] for business_type in business_types]
+    else:
+        type_filters = [business_types]
+    results = await asyncio.gather(*[
+        search_nearby_places(
+            latitude=coords["latitude"],
+            longitude=coords["longitude"],
+            radius_km=radius_km,
+            included_types=type_filter,
+            client=client
+        )
+        for type_filter in type_filters
+    ])
+    
+    # Flatten and dedupe places found for several types
+    places_by_id: Dict[str, Dict[str, Any]] = {}
+    for type_places in results:
+        for place in type_places:
+            places_by_id.setdefault(place.get("id"), place)
+    places = list(places_by_id.values())
     
     # Extract websites
     websites = []
@@ -202,10 +222,25 @@ def scrape_websites_sync(
 ) -> List[Dict[str, Any]]:
     """Synchronous wrapper for scraping."""
     return asyncio.run(
-        scrape_websites_from_location(location, radius_km, business_types)
+        scrape_websites_with_own_client(location, radius_km, business_types)
     )
 
 
+async def scrape_websites_with_own_client(
+    location: str,
+    radius_km: float = 10.0,
+    business_types: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Scrape with a dedicated client for callers running their own event loop.
+    The shared client's pooled connections belong to the app's loop.
+    """
+    async with create_client() as client:
+        return await scrape_websites_from_location(
+            location, radius_km, business_types, client=client
+        )
+
+
 # Screenshot capture placeholder
 async def capture_screenshot(url: str, output_path: str) -> bool:
     """
@@ -2,14 +2,19 @@
 Google Places API Text Search Service.
 Implements text-based search with pagination for restaurant aggregation.
 """
+import heapq
 import httpx
 import logging
 from typing import List, Optional, Dict, Any
 
 from config import get_settings
+from http_client import get_client
 
 logger = logging.getLogger(__name__)
 
+# Get API key from config
+settings = get_settings()
+
 # Text Search API endpoint (New Places API)
 TEXT_SEARCH_URL = "https://places.googleapis.com/v1/places:searchText"
 
@@ -61,7 +66,8 @@ async def search_places_text(
     query: str,
     min_rating: Optional[float] = None,
     max_results: int = 60,
-    language_code: str = "de"
+    language_code: str = "de",
+    client: Optional[httpx.AsyncClient] = None
 ) -> List[PlaceResult]:
     """
     Search for places using text query with pagination.
@@ -71,6 +77,7 @@ async def search_places_text(
         min_rating: Optional minimum rating filter (1.0-5.0)
         max_results: Maximum number of results to fetch (default 60)
         language_code: Language for results (default "de")
+        client: HTTP client to use (defaults to the shared client)
     
     Returns:
         List of PlaceResult sorted by userRatingCount descending
@@ -79,12 +86,11 @@ async def search_places_text(
         GooglePlacesError: If API call fails
         QuotaExceededError: If API quota is exceeded
     """
-    settings = get_settings()
-    
     if not settings.google_maps_api_key:
         raise GooglePlacesError("GOOGLE_MAPS_API_KEY not configured")
     
-    all_places: List[PlaceResult] = []
+    # Keyed by place ID, since the same place can show up on several pages
+    seen: Dict[str, PlaceResult] = {}
     next_page_token: Optional[str] = None
     
     headers = {
@@ -93,75 +99,79 @@ async def search_places_text(
         "X-Goog-FieldMask": FIELD_MASK
     }
     
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        while len(all_places) < max_results:
-            # Build request body
-            request_body: Dict[str, Any] = {
-                "textQuery": query,
-                "languageCode": language_code,
-            }
-            
-            if min_rating is not None:
-                request_body["minRating"] = min_rating
-            
-            if next_page_token:
-                request_body["pageToken"] = next_page_token
-            
-            logger.info(f"Searching places: query='{query}', page_token={bool(next_page_token)}")
-            
-            try:
-                response = await client.post(
-                    TEXT_SEARCH_URL,
-                    json=request_body,
-                    headers=headers
-                )
-            except httpx.TimeoutException:
-                raise GooglePlacesError("API request timed out")
-            except httpx.RequestError as e:
-                raise GooglePlacesError(f"API request failed: {e}")
-            
-            # Handle error responses
-            if response.status_code == 429:
-                raise QuotaExceededError("API quota exceeded - please try again later")
-            
-            if response.status_code != 200:
-                error_detail = response.text[:200] if response.text else "Unknown error"
-                logger.error(f"Places API error: {response.status_code} - {error_detail}")
-                raise GooglePlacesError(f"API error ({response.status_code}): {error_detail}")
-            
-            data = response.json()
-            places = data.get("places", [])
-            
-            # Parse results
-            for place in places:
-                display_name = place.get("displayName", {})
-                name = display_name.get("text", "Unknown")
-                
-                result = PlaceResult(
-                    google_place_id=place.get("id", ""),
-                    name=name,
-                    rating_count=place.get("userRatingCount", 0),
-                    rating_score=place.get("rating"),
-                    website_url=place.get("websiteUri")
-                )
-                all_places.append(result)
-            
-            logger.info(f"Fetched {len(places)} places, total: {len(all_places)}")
+    client = client or get_client()
+    while len(seen) < max_results:
+        # Build request body
+        request_body: Dict[str, Any] = {
+            "textQuery": query,
+            "languageCode": language_code,
+        }
+        
+        if min_rating is not None:
+            request_body["minRating"] = min_rating
+        
+        if next_page_token:
+            request_body["pageToken"] = next_page_token
+        
+        logger.info(f"Searching places: query='{query}', page_token={bool(next_page_token)}")
+        
+        try:
+            response = await client.post(
+                TEXT_SEARCH_URL,
+                json=request_body,
+                headers=headers
+            )
+        except httpx.TimeoutException:
+            raise GooglePlacesError("API request timed out")
+        except httpx.RequestError as e:
+            raise GooglePlacesError(f"API request failed: {e}")
+        
+        # Handle error responses
+        if response.status_code == 429:
+            raise QuotaExceededError("API quota exceeded - please try again later")
+        
+        if response.status_code != 200:
+            error_detail = response.text[:200] if response.text else "Unknown error"
+            logger.error(f"Places API error: {response.status_code} - {error_detail}")
+            raise GooglePlacesError(f"API error ({response.status_code}): {error_detail}")
+        
+        data = response.json()
+        places = data.get("places", [])
+        
+        # Parse results
+        for place in places:
+            place_id = place.get("id", "")
+            if place_id in seen:
+                continue
             
-            # Check for next page
-            next_page_token = data.get("nextPageToken")
+            display_name = place.get("displayName", {})
+            name = display_name.get("text", "Unknown")
             
-            if not next_page_token or len(places) == 0:
-                break
-    
-    # Sort by rating count descending
-    all_places.sort(key=lambda p: p.rating_count, reverse=True)
+            result = PlaceResult(
+                google_place_id=place_id,
+                name=name,
+                rating_count=place.get("userRatingCount", 0),
+                rating_score=place.get("rating"),
+                website_url=place.get("websiteUri")
+            )
+            seen[place_id] = result
+        
+        logger.info(f"Fetched {len(places)} places, total: {len(seen)}")
+        
+        # Check for next page
+        next_page_token = data.get("nextPageToken")
+        
+        if not next_page_token or len(places) == 0:
+            break
+
+    # Top results by rating count descending
+    top_places = heapq.nlargest(max_results, seen.values(), key=lambda p: p.rating_count)
     
     # Assign ranks
-    for idx, place in enumerate(all_places):
+    for idx, place in enumerate(top_places):
         place.rank = idx + 1
     
-    return all_places[:max_results]
+    return top_places
 
 
 async def aggregate_places(
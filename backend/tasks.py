@@ -4,80 +4,120 @@ Handles async scraping and website processing.
 """
 import asyncio
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 import logging
 
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from database import SessionLocal
-from models import Website, ScrapeJob
+from models import Website, ScrapeJob, url_hash
 from scraper import scrape_websites_from_location
 
 logger = logging.getLogger(__name__)
 
 
-def run_scrape_job(job_id: int):
+def insert_websites_ignore_duplicates(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """
+    Bulk-insert website rows, skipping URLs that already exist.
+    Returns the number of rows actually inserted.
+    """
+    if not rows:
+        return 0
+    
+    # One IN query against the compact url_sha1 index instead of a lookup per row
+    hashes = [url_hash(row["url"]) for row in rows]
+    seen = set(db.scalars(select(Website.url_sha1).where(Website.url_sha1.in_(hashes))).all())
+    new_rows = []
+    for row, row_hash in zip(rows, hashes):
+        if row_hash in seen:
+            continue
+        seen.add(row_hash)
+        new_rows.append({**row, "url_sha1": row_hash})
+    
+    if not new_rows:
+        return 0
+    
+    # ON CONFLICT still guards against rows inserted concurrently
+    insert = pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+    stmt = insert(Website).values(new_rows).on_conflict_do_nothing(index_elements=["url"])
+    result = db.execute(stmt)
+    return result.rowcount if result.rowcount >= 0 else len(new_rows)
+
+
+def start_scrape_job(db: Session, job_id: int) -> Optional[ScrapeJob]:
+    """Load a scrape job and mark it as running."""
+    job = db.query(ScrapeJob).filter(ScrapeJob.id == job_id).first()
+    if not job:
+        logger.error(f"Scrape job {job_id} not found")
+        return None
+    
+    job.status = "running"
+    db.commit()
+    return job
+
+
+def store_scraped_websites(db: Session, job: ScrapeJob, websites_data: List[Dict[str, Any]]) -> int:
+    """Insert scraped websites and mark the job as completed."""
+    # Add websites to database in one statement
+    source = f"gmaps:{job.location}:{','.join(job.business_types or [])}"
+    rows = [
+        {
+            "url": website_data["url"],
+            "name": website_data.get("name"),
+            "address": website_data.get("address"),
+            "phone": website_data.get("phone"),
+            "business_type": website_data.get("business_type"),
+            "gmaps_place_id": website_data.get("gmaps_place_id"),
+            "source": source,
+        }
+        for website_data in websites_data
+    ]
+    websites_added = insert_websites_ignore_duplicates(db, rows)
+    
+    # Update job status
+    job.status = "completed"
+    job.websites_found = websites_added
+    job.completed_at = datetime.utcnow()
+    db.commit()
+    return websites_added
+
+
+def fail_scrape_job(db: Session, job: ScrapeJob, error: Exception):
+    """Mark a scrape job as failed."""
+    db.rollback()
+    job.status = "failed"
+    job.error_message = str(error)
+    db.commit()
+
+
+async def run_scrape_job_async(job_id: int):
     """
     Execute a scraping job in the background.
-    This function is designed to be run in a background thread.
+    Runs on the app's event loop so the scraper reuses the shared HTTP client;
+    blocking database work is offloaded with asyncio.to_thread.
     """
     db = SessionLocal()
+    job = None
     try:
-        job = db.query(ScrapeJob).filter(ScrapeJob.id == job_id).first()
+        job = await asyncio.to_thread(start_scrape_job, db, job_id)
         if not job:
-            logger.error(f"Scrape job {job_id} not found")
             return
         
-        # Update status to running
-        job.status = "running"
-        db.commit()
-        
-        # Run the async scraper
-        websites_data = asyncio.run(
-            scrape_websites_from_location(
-                location=job.location,
-                radius_km=job.radius_km,
-                business_types=job.business_types
-            )
+        websites_data = await scrape_websites_from_location(
+            location=job.location,
+            radius_km=job.radius_km,
+            business_types=job.business_types
         )
         
-        # Store coordinates if we got results
-        if websites_data:
-            # We could store lat/lng on the job here if needed
-            pass
-        
-        # Add websites to database
-        websites_added = 0
-        for website_data in websites_data:
-            # Check for duplicate URL
-            existing = db.query(Website).filter(Website.url == website_data["url"]).first()
-            if existing:
-                continue
-            
-            website = Website(
-                url=website_data["url"],
-                name=website_data.get("name"),
-                address=website_data.get("address"),
-                phone=website_data.get("phone"),
-                business_type=website_data.get("business_type"),
-                gmaps_place_id=website_data.get("gmaps_place_id"),
-                source=f"gmaps:{job.location}:{','.join(job.business_types or [])}"
-            )
-            db.add(website)
-            websites_added += 1
-        
-        # Update job status
-        job.status = "completed"
-        job.websites_found = websites_added
-        job.completed_at = datetime.utcnow()
-        db.commit()
+        websites_added = await asyncio.to_thread(store_scraped_websites, db, job, websites_data)
         
         logger.info(f"Scrape job {job_id} completed: {websites_added} websites added")
         
     except Exception as e:
         logger.exception(f"Scrape job {job_id} failed: {e}")
         if job:
-            job.status = "failed"
-            job.error_message = str(e)
-            db.commit()
+            await asyncio.to_thread(fail_scrape_job, db, job, e)
     finally:
-        db.close()
+        await asyncio.to_thread(db.close)